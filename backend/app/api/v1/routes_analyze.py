@@ -1,65 +1,90 @@
-from pathlib import Path
+import asyncio
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
 from app.services.mistral_client import get_mistral_client
 from app.services.analysis_service import (
-    load_dataset,
     generate_ux_insights,
     DatasetError,
     AnalysisError
 )
+from app.core.config import get_settings
+from app.services.dataset_loader import get_dataset_registry, DatasetNotFoundError
+from app.services.prompt_loader import (
+    get_prompt_template,
+    PromptError,
+    ANALYSIS_PROMPT_NAME
+)
+from app.services.chat_service import get_chat_session_store
 from app.schemas.analysis import UXInsightsResponse
 
 
 router = APIRouter(tags=["Analysis"])
 
 
-DATASET_PATH = Path(__file__).resolve().parent.parent.parent.parent.parent / "datasets" / "online_shoppers_intention.csv"
-PROMPT_PATH = Path(__file__).resolve().parent.parent.parent.parent.parent / "prompts" / "ux_analysis_prompt.md"
-
-
 @router.get("/analyze", response_model=UXInsightsResponse)
-async def analyze_ux():
+async def analyze_ux(
+    dataset_id: Optional[str] = Query(
+        default=None,
+        description="Dataset to analyze (file stem under datasets/); defaults to DEFAULT_DATASET_ID"
+    )
+):
     """
     Analyze e-commerce dataset and generate UX insights.
     
-    Loads the local dataset, computes metrics, and uses Mistral AI
-    to generate structured, actionable UX recommendations.
+    Loads the requested dataset, computes metrics, and uses Mistral AI
+    to generate structured, actionable UX recommendations. The result is
+    published as the dataset's latest insights for new chat sessions.
+    
+    Args:
+        dataset_id: Optional dataset identifier from GET /datasets
     
     Returns:
         UXInsightsResponse with insights, metrics, and executive summary
         
     Raises:
+        HTTPException 404: Unknown dataset_id
         HTTPException 500: Dataset loading or processing error
         HTTPException 502: LLM service error or invalid response
     """
+    dataset_id = dataset_id or get_settings().default_dataset_id
+    registry = get_dataset_registry()
+    
     try:
-        df = load_dataset(str(DATASET_PATH))
+        dataset_version = await asyncio.to_thread(registry.dataset_version, dataset_id)
+        df, metrics = await asyncio.to_thread(registry.get_frame_and_metrics, dataset_id)
+    except DatasetNotFoundError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
     except DatasetError as e:
         raise HTTPException(
             status_code=500,
             detail=f"Dataset error: {str(e)}"
         )
-    
-    try:
-        with open(PROMPT_PATH, "r", encoding="utf-8") as f:
-            prompt_template = f.read()
-    except FileNotFoundError:
+    except AnalysisError as e:
         raise HTTPException(
-            status_code=500,
-            detail=f"Prompt template not found: {PROMPT_PATH}"
+            status_code=502,
+            detail=f"Analysis service error: {str(e)}"
         )
-    except Exception as e:
+    
+    try:
+        prompt_template = get_prompt_template(ANALYSIS_PROMPT_NAME)
+    except PromptError as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to load prompt template: {str(e)}"
+            detail=str(e)
         )
     
     mistral_client = get_mistral_client()
     
     try:
-        insights = await generate_ux_insights(mistral_client, df, prompt_template)
+        insights = await generate_ux_insights(
+            mistral_client, df, prompt_template, metrics_dict=metrics
+        )
+        get_chat_session_store().publish_insights(dataset_id, insights, dataset_version)
         return insights
     except AnalysisError as e:
         raise HTTPException(
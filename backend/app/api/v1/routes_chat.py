@@ -1,131 +1,154 @@
-from pathlib import Path
+import asyncio
 
 from fastapi import APIRouter, HTTPException
 
 from app.services.mistral_client import get_mistral_client, MistralClientError
 from app.services.analysis_service import (
-    load_dataset,
     generate_ux_insights,
     DatasetError,
     AnalysisError
 )
+from app.core.config import get_settings
+from app.services.dataset_loader import get_dataset_registry, DatasetNotFoundError
+from app.services.prompt_loader import (
+    get_prompt_template,
+    PromptError,
+    ANALYSIS_PROMPT_NAME,
+    CHAT_PROMPT_NAME
+)
+from app.services.chat_service import (
+    build_chat_messages,
+    get_chat_session_store,
+    ChatSessionNotFoundError,
+    InsightsSnapshot
+)
 from app.schemas.chat import UXChatRequest, UXChatResponse
 
 
 router = APIRouter(tags=["Chat"])
 
 
-DATASET_PATH = Path(__file__).resolve().parent.parent.parent.parent.parent / "datasets" / "online_shoppers_intention.csv"
-ANALYSIS_PROMPT_PATH = Path(__file__).resolve().parent.parent.parent.parent.parent / "prompts" / "ux_analysis_prompt.md"
-CHAT_PROMPT_PATH = Path(__file__).resolve().parent.parent.parent.parent.parent / "prompts" / "ux_chat_prompt.md"
-
-
-def build_insights_context(insights_response) -> str:
-    """
-    Build a text context from UXInsightsResponse for chat prompt injection.
-    
-    Args:
-        insights_response: UXInsightsResponse with insights and metrics
-        
-    Returns:
-        Formatted string with summary, insights, and key metrics
-    """
-    context_parts = [
-        "## Executive Summary",
-        insights_response.summary,
-        "",
-        "## UX Insights",
-        ""
-    ]
-    
-    for insight in insights_response.insights:
-        context_parts.extend([
-            f"### {insight.title} (Severity: {insight.severity})",
-            f"- **ID**: {insight.id}",
-            f"- **Evidence**: {insight.metric_evidence}",
-            f"- **Hypothesis**: {insight.hypothesized_cause}",
-            f"- **Recommendation**: {insight.recommendation}",
-            f"- **Target Segment**: {insight.target_segment}",
-            ""
-        ])
-    
-    context_parts.extend([
-        "## Key Metrics",
-        f"- Total Sessions: {insights_response.metrics.total_sessions:,}",
-        f"- Total Conversions: {insights_response.metrics.total_conversions:,}",
-        f"- Conversion Rate: {insights_response.metrics.conversion_rate}%",
-        f"- Average Bounce Rate: {insights_response.metrics.avg_bounce_rate:.2%}",
-        f"- Average Exit Rate: {insights_response.metrics.avg_exit_rate:.2%}",
-        f"- Weekend Conversion Rate: {insights_response.metrics.weekend_conversion_rate}%",
-        f"- Weekday Conversion Rate: {insights_response.metrics.weekday_conversion_rate}%",
-        ""
-    ])
-    
-    return "\n".join(context_parts)
-
-
-@router.post("/chat", response_model=UXChatResponse)
-async def chat_ux(request: UXChatRequest):
+async def _latest_or_generate_insights(dataset_id: str) -> InsightsSnapshot:
     """
-    Answer user questions about UX insights using AI.
-    
-    Loads dataset insights and uses Mistral AI to provide contextual,
-    evidence-based answers to user questions about UX analysis.
+    Return the latest published insights for a dataset, generating them if none exist
+    or the dataset has changed (new shared snapshot version) since they were published.
     
-    Args:
-        request: UXChatRequest with user question
-        
-    Returns:
-        UXChatResponse with AI-generated answer
-        
     Raises:
+        HTTPException 404: Unknown dataset_id
         HTTPException 500: Dataset or prompt loading error
         HTTPException 502: LLM service error
     """
+    store = get_chat_session_store()
+    registry = get_dataset_registry()
+    
     try:
-        df = load_dataset(str(DATASET_PATH))
+        dataset_version = await asyncio.to_thread(registry.dataset_version, dataset_id)
+        snapshot = store.latest_insights(dataset_id, dataset_version)
+        if snapshot is not None:
+            return snapshot
+        df, metrics = await asyncio.to_thread(registry.get_frame_and_metrics, dataset_id)
+    except DatasetNotFoundError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
     except DatasetError as e:
         raise HTTPException(
             status_code=500,
             detail=f"Dataset error: {str(e)}"
         )
-    
-    try:
-        with open(ANALYSIS_PROMPT_PATH, "r", encoding="utf-8") as f:
-            analysis_prompt = f.read()
-    except FileNotFoundError:
+    except AnalysisError as e:
         raise HTTPException(
-            status_code=500,
-            detail=f"Analysis prompt not found: {ANALYSIS_PROMPT_PATH}"
+            status_code=502,
+            detail=f"Failed to generate insights: {str(e)}"
         )
     
     try:
-        with open(CHAT_PROMPT_PATH, "r", encoding="utf-8") as f:
-            chat_prompt_template = f.read()
-    except FileNotFoundError:
+        analysis_prompt = get_prompt_template(ANALYSIS_PROMPT_NAME)
+    except PromptError as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Chat prompt not found: {CHAT_PROMPT_PATH}"
+            detail=str(e)
         )
     
-    mistral_client = get_mistral_client()
-    
     try:
-        insights = await generate_ux_insights(mistral_client, df, analysis_prompt)
+        insights = await generate_ux_insights(
+            get_mistral_client(), df, analysis_prompt, metrics_dict=metrics
+        )
     except (AnalysisError, MistralClientError) as e:
         raise HTTPException(
             status_code=502,
             detail=f"Failed to generate insights: {str(e)}"
         )
     
-    insights_context = build_insights_context(insights)
+    return store.publish_insights(dataset_id, insights, dataset_version)
+
+
+@router.post("/chat", response_model=UXChatResponse)
+async def chat_ux(request: UXChatRequest):
+    """
+    Answer user questions about UX insights using AI.
+    
+    Starts a server-side conversation, or continues one when `session_id`
+    is given. New conversations use the latest insights published by
+    /analyze for the dataset (generating them if there are none yet).
+    Each turn sends the cached system prompt, the most recent history
+    that fits the token budget, and the new question.
     
-    final_prompt = chat_prompt_template.replace("{insights_context}", insights_context)
-    final_prompt = final_prompt.replace("{user_question}", request.question)
+    Args:
+        request: UXChatRequest with user question, optional dataset_id and session_id
+    
+    Returns:
+        UXChatResponse with AI-generated answer and the session_id to reuse
+    
+    Raises:
+        HTTPException 400: dataset_id does not match the session's dataset
+        HTTPException 404: Unknown dataset_id, or unknown/expired session_id
+        HTTPException 500: Dataset or prompt loading error
+        HTTPException 502: LLM service error
+    """
+    settings = get_settings()
+    store = get_chat_session_store()
+    
+    if request.session_id:
+        try:
+            session = store.get_session(request.session_id)
+        except ChatSessionNotFoundError as e:
+            raise HTTPException(
+                status_code=404,
+                detail=str(e)
+            )
+        if request.dataset_id and request.dataset_id != session.dataset_id:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Session {session.session_id} is bound to dataset "
+                    f"'{session.dataset_id}'; start a new session to switch datasets"
+                )
+            )
+    else:
+        dataset_id = request.dataset_id or settings.default_dataset_id
+        snapshot = await _latest_or_generate_insights(dataset_id)
+        session = store.create_session(snapshot)
     
     try:
-        answer = await mistral_client.generate_completion(
-            prompt=final_prompt,
+        chat_prompt_template = get_prompt_template(CHAT_PROMPT_NAME)
+    except PromptError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=str(e)
+        )
+    
+    messages = build_chat_messages(
+        session,
+        system_prompt=session.snapshot.system_prompt(chat_prompt_template),
+        question=request.question,
+        history_token_budget=settings.chat_history_token_budget
+    )
+    
+    try:
+        answer = await get_mistral_client().generate_chat_completion(
+            messages=messages,
             temperature=0.3,
             max_tokens=600
         )
@@ -135,8 +158,11 @@ async def chat_ux(request: UXChatRequest):
             detail=f"Chat completion failed: {str(e)}"
         )
     
+    answer = answer.strip()
+    store.record_turn(session, request.question, answer)
+    
     return UXChatResponse(
-        answer=answer.strip(),
-        used_insights=None
+        answer=answer,
+        used_insights=None,
+        session_id=session.session_id
     )
-
@@ -0,0 +1,64 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException
+
+from app.core.config import get_settings
+from app.services.analysis_service import DatasetError
+from app.services.dataset_loader import get_dataset_registry, DatasetNotFoundError
+from app.schemas.dataset import DatasetRegistryStats, DatasetMemoryReport
+
+
+router = APIRouter(tags=["Datasets"])
+
+
+@router.get("/datasets", response_model=DatasetRegistryStats)
+async def list_datasets():
+    """
+    List available datasets with cache memory and eviction statistics.
+    
+    Rescans `datasets/` so newly added files appear without a restart.
+    
+    Returns:
+        DatasetRegistryStats keyed by dataset_id
+    """
+    registry = get_dataset_registry()
+    await asyncio.to_thread(registry.discover)
+    stats = await asyncio.to_thread(registry.stats)
+    
+    return DatasetRegistryStats(
+        default_dataset_id=get_settings().default_dataset_id,
+        **stats
+    )
+
+
+@router.get("/datasets/{dataset_id}/memory", response_model=DatasetMemoryReport)
+async def dataset_memory(dataset_id: str):
+    """
+    Report the in-memory dtype and size of every column of a dataset.
+    
+    Loads the dataset into the cache if it is not already resident.
+    
+    Args:
+        dataset_id: Dataset identifier from GET /datasets
+        
+    Returns:
+        DatasetMemoryReport with per-column bytes
+        
+    Raises:
+        HTTPException 404: Unknown dataset_id
+        HTTPException 500: Dataset loading error
+    """
+    try:
+        report = await asyncio.to_thread(get_dataset_registry().memory_report, dataset_id)
+    except DatasetNotFoundError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
+    except DatasetError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Dataset error: {str(e)}"
+        )
+    
+    return DatasetMemoryReport(**report)
@@ -1,24 +1,51 @@
+from functools import lru_cache
 from pathlib import Path
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
+DATASETS_DIR = BASE_DIR / "datasets"
+PROMPTS_DIR = BASE_DIR / "prompts"
 
 
 class Settings(BaseSettings):
     """
     Application configuration loaded from environment variables.
-    
+
     Required:
         MISTRAL_API_KEY: Your Mistral AI API key
         MISTRAL_MODEL_ID: Model identifier (default: mistral-medium-3.1)
+
+    Optional:
+        STARTUP_MODE: "warm" to load the dataset, prompts and HTTP pool in the
+            background at startup, "lazy" to defer everything to the first request
+        DEFAULT_DATASET_ID: Dataset used when a request does not name one
+        DATASET_MEMORY_BUDGET_MB: Total memory for cached datasets (LRU-evicted)
+        DATASET_STORAGE: "process" to parse datasets in every worker, "shared"
+            to attach all workers to one memory-mapped snapshot
+        SHARED_DATASET_DIR: Snapshot directory for shared storage
+            (default: /dev/shm/insightchat-datasets)
+        CHAT_SESSION_TTL_SECONDS: Idle time before a chat session is dropped
+        CHAT_MAX_SESSIONS: Maximum chat sessions kept in memory
+        CHAT_MAX_HISTORY_MESSAGES: Messages stored per chat session
+        CHAT_HISTORY_TOKEN_BUDGET: Estimated tokens of history sent per turn
     """
-    
+
     mistral_api_key: str
     mistral_model_id: str = "mistral-medium-3.1"
     mistral_base_url: str = "https://api.mistral.ai/v1"
-    
+    startup_mode: Literal["warm", "lazy"] = "warm"
+    default_dataset_id: str = "online_shoppers_intention"
+    dataset_memory_budget_mb: int = 512
+    dataset_storage: Literal["process", "shared"] = "process"
+    shared_dataset_dir: Optional[Path] = None
+    chat_session_ttl_seconds: int = 1800
+    chat_max_sessions: int = 1000
+    chat_max_history_messages: int = 20
+    chat_history_token_budget: int = 1500
+
     model_config = SettingsConfigDict(
         env_file=BASE_DIR / ".env",
         env_file_encoding="utf-8",
@@ -26,5 +53,12 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the application settings, built on first access.
 
+    Deferring construction keeps `import app.main` free of environment
+    and `.env` parsing, so a missing key fails at use time instead of import time.
+    """
+    return Settings()
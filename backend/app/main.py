@@ -1,14 +1,43 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from app.core.config import get_settings
+from app.api.v1 import routes_analyze, routes_chat, routes_datasets
+from app.services.mistral_client import get_mistral_client
+from app.services.warmup import warm_up, warmup_state
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the background warm-up and release pooled resources on shutdown.
 
-from app.core.config import settings
-from app.api.v1 import routes_analyze, routes_chat
+    In "warm" startup mode the dataset, prompts and HTTP pool are loaded
+    while the server is already accepting `/health` probes; `/ready` flips
+    once warm-up has finished. In "lazy" mode the first request pays instead.
+    """
+    warmup_task = None
+    if get_settings().startup_mode == "warm":
+        warmup_task = asyncio.create_task(warm_up())
+    else:
+        warmup_state.ready = True
+
+    yield
+
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    await get_mistral_client().aclose()
 
 
 app = FastAPI(
     title="InsightChat API",
     description="Mistral-powered UX Analytics Assistant",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -21,6 +50,7 @@ app.add_middleware(
 
 app.include_router(routes_analyze.router, prefix="/api/v1")
 app.include_router(routes_chat.router, prefix="/api/v1")
+app.include_router(routes_datasets.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -38,6 +68,17 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "mistral_configured": bool(settings.mistral_api_key)
+        "mistral_configured": bool(get_settings().mistral_api_key)
     }
 
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness endpoint, separate from liveness.
+
+    Returns 503 until the startup warm-up has finished; steps that failed
+    are listed in `error` and fall back to lazy loading.
+    """
+    status_code = 200 if warmup_state.ready else 503
+    return JSONResponse(status_code=status_code, content=warmup_state.as_dict())
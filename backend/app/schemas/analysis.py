@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Literal
+from typing import List, Dict, Any, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -37,7 +37,8 @@ class ComputedMetrics(BaseModel):
     """
     Raw metrics computed from the dataset before LLM analysis.
     
-    Includes conversion rates, engagement indicators, and segmentation data.
+    Includes conversion rates, engagement indicators, and segmentation data,
+    plus tail quantiles, page-type engagement and the engagement funnel.
     """
     
     total_sessions: int
@@ -52,6 +53,18 @@ class ComputedMetrics(BaseModel):
     weekday_conversion_rate: float
     visitor_type_breakdown: Dict[str, Dict[str, Any]]
     top_converting_months: List[Dict[str, Any]]
+    distribution_quantiles: Dict[str, Dict[str, Optional[float]]] = Field(
+        default_factory=dict,
+        description="p50/p90/p99 per column, from mergeable KLL sketches"
+    )
+    page_type_engagement: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Reach, depth, duration and conversion per page type"
+    )
+    engagement_funnel: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Sessions, share of sessions and conversion rate per independent funnel stage"
+    )
 
 
 class UXInsightsResponse(BaseModel):
@@ -6,7 +6,8 @@ class UXChatRequest(BaseModel):
     """
     Request model for UX chat endpoint.
     
-    User sends a question about generated UX insights.
+    User sends a question about generated UX insights, optionally
+    continuing an existing conversation.
     """
     
     question: str = Field(
@@ -15,6 +16,14 @@ class UXChatRequest(BaseModel):
         max_length=500,
         description="User question about UX insights or metrics"
     )
+    dataset_id: Optional[str] = Field(
+        default=None,
+        description="Dataset to chat about; defaults to DEFAULT_DATASET_ID"
+    )
+    session_id: Optional[str] = Field(
+        default=None,
+        description="Session returned by a previous turn; omit to start a new conversation"
+    )
 
 
 class UXChatResponse(BaseModel):
@@ -32,4 +41,8 @@ class UXChatResponse(BaseModel):
         default=None,
         description="IDs of insights referenced in the answer"
     )
+    session_id: str = Field(
+        ...,
+        description="Session to pass back on follow-up questions"
+    )
 
@@ -0,0 +1,49 @@
+from typing import Dict, Optional
+from pydantic import BaseModel, Field
+
+
+class DatasetCacheStats(BaseModel):
+    """
+    Cache state and counters for a single registered dataset.
+    """
+    
+    loaded: bool = Field(..., description="Whether the dataset is currently in memory")
+    version: Optional[int] = Field(
+        default=None,
+        description="Attached shared snapshot version (shared storage only)"
+    )
+    memory_bytes: int = Field(..., description="Memory held by the frame and its aggregates")
+    hits: int = Field(..., description="Requests served from the cache")
+    loads: int = Field(..., description="Times the file was read from disk")
+    evictions: int = Field(..., description="Times the dataset was evicted from the cache")
+
+
+class ColumnMemory(BaseModel):
+    """In-memory dtype and size of a single dataset column."""
+    
+    dtype: str
+    bytes: int
+
+
+class DatasetMemoryReport(BaseModel):
+    """
+    Response model for the per-column memory footprint endpoint.
+    """
+    
+    dataset_id: str
+    total_bytes: int
+    columns: Dict[str, ColumnMemory]
+
+
+class DatasetRegistryStats(BaseModel):
+    """
+    Response model for the dataset listing endpoint.
+    
+    Lists every discovered dataset with memory and eviction statistics.
+    """
+    
+    default_dataset_id: str
+    memory_budget_bytes: int
+    memory_used_bytes: int
+    evictions: int
+    datasets: Dict[str, DatasetCacheStats]
@@ -1,12 +1,15 @@
+from __future__ import annotations
+
 import json
 from pathlib import Path
-from typing import Dict, Any
-
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, Any, Optional
 
 from app.services.mistral_client import MistralClient
 from app.schemas.analysis import UXInsightsResponse, UXInsight, ComputedMetrics
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class DatasetError(Exception):
     """Raised when dataset loading or validation fails."""
@@ -18,10 +21,25 @@ class AnalysisError(Exception):
     pass
 
 
+CATEGORICAL_COLUMNS = ("Month", "VisitorType")
+BOOLEAN_COLUMNS = ("Weekend", "Revenue")
+INTEGER_COLUMNS = (
+    "Administrative", "Informational", "ProductRelated",
+    "OperatingSystems", "Browser", "Region", "TrafficType"
+)
+FLOAT_COLUMNS = (
+    "Administrative_Duration", "Informational_Duration", "ProductRelated_Duration",
+    "BounceRates", "ExitRates", "PageValues", "SpecialDay"
+)
+
+
 def load_dataset(path: str) -> pd.DataFrame:
     """
     Load and validate the e-commerce dataset.
     
+    The compact session schema (see `apply_session_schema`) is applied
+    before the frame is returned.
+    
     Args:
         path: Path to the CSV file
         
@@ -31,6 +49,8 @@ def load_dataset(path: str) -> pd.DataFrame:
     Raises:
         DatasetError: If file is missing or has invalid structure
     """
+    import pandas as pd
+    
     file_path = Path(path)
     
     if not file_path.exists():
@@ -50,9 +70,95 @@ def load_dataset(path: str) -> pd.DataFrame:
     if missing_columns:
         raise DatasetError(f"Missing required columns: {', '.join(missing_columns)}")
     
+    try:
+        return apply_session_schema(df)
+    except Exception as e:
+        raise DatasetError(f"Failed to apply dataset schema: {str(e)}")
+
+
+def apply_session_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert session columns to compact, explicit dtypes.
+    
+    - `Month`, `VisitorType`: category
+    - `Weekend`, `Revenue`: bool ("TRUE"/"FALSE" strings are parsed)
+    - page counts and segment IDs: smallest integer type that fits
+    - durations and rates: float32
+    
+    Columns outside the schema are left as inferred; missing ones are skipped.
+    
+    Args:
+        df: DataFrame as returned by `pd.read_csv`
+        
+    Returns:
+        New DataFrame with the compact dtypes applied
+    """
+    import pandas as pd
+    
+    df = df.copy()
+    
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    
+    for col in BOOLEAN_COLUMNS:
+        if col in df.columns:
+            df[col] = _as_bool(df[col])
+    
+    for col in INTEGER_COLUMNS:
+        if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+    
+    for col in FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("float32")
+    
     return df
 
 
+def memory_footprint(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Report in-memory size per column, including string payloads.
+    
+    Args:
+        df: Any DataFrame
+        
+    Returns:
+        Dictionary with total bytes and per-column dtype and bytes
+    """
+    usage = df.memory_usage(deep=True, index=False)
+    
+    return {
+        "total_bytes": int(usage.sum()),
+        "columns": {
+            str(col): {"dtype": str(df[col].dtype), "bytes": int(usage[col])}
+            for col in df.columns
+        }
+    }
+
+
+def _as_bool(series: pd.Series) -> pd.Series:
+    """Return a boolean view of a column holding bools or "TRUE"/"FALSE" strings."""
+    if series.dtype == bool:
+        return series
+    return series.astype(str).str.upper() == "TRUE"
+
+
+def _conversion_breakdown(revenue: pd.Series, by: pd.Series) -> Dict[str, Dict[str, Any]]:
+    """Sessions, conversions and conversion rate per group, in order of appearance."""
+    grouped = revenue.groupby(by, sort=False, observed=True).agg(["size", "sum"])
+    
+    breakdown = {}
+    for key, sessions, conversions in zip(grouped.index, grouped["size"], grouped["sum"]):
+        rate = (conversions / sessions * 100) if sessions > 0 else 0.0
+        breakdown[str(key)] = {
+            "sessions": int(sessions),
+            "conversions": int(conversions),
+            "conversion_rate": round(float(rate), 2)
+        }
+    return breakdown
+
+
 def compute_basic_metrics(df: pd.DataFrame) -> Dict[str, Any]:
     """
     Calculate fundamental UX and conversion metrics.
@@ -65,51 +171,35 @@ def compute_basic_metrics(df: pd.DataFrame) -> Dict[str, Any]:
     """
     total_sessions = len(df)
     
-    revenue_column = df["Revenue"].astype(str).str.upper()
-    conversions = (revenue_column == "TRUE").sum()
+    revenue = _as_bool(df["Revenue"])
+    conversions = int(revenue.sum())
     conversion_rate = (conversions / total_sessions * 100) if total_sessions > 0 else 0.0
     
-    avg_bounce_rate = df["BounceRates"].mean()
-    avg_exit_rate = df["ExitRates"].mean()
-    avg_page_value = df["PageValues"].mean()
+    avg_bounce_rate = float(df["BounceRates"].mean())
+    avg_exit_rate = float(df["ExitRates"].mean())
+    avg_page_value = float(df["PageValues"].mean())
     
-    weekend_column = df["Weekend"].astype(str).str.upper()
-    weekend_sessions = (weekend_column == "TRUE").sum()
+    weekend = _as_bool(df["Weekend"])
+    weekend_sessions = int(weekend.sum())
     weekday_sessions = total_sessions - weekend_sessions
     
-    weekend_conversions = df[weekend_column == "TRUE"]
-    weekday_conversions = df[weekend_column == "FALSE"]
-    
     weekend_conv_rate = (
-        (weekend_conversions["Revenue"].astype(str).str.upper() == "TRUE").sum() 
-        / len(weekend_conversions) * 100
-    ) if len(weekend_conversions) > 0 else 0.0
+        float(revenue[weekend].mean()) * 100
+    ) if weekend_sessions > 0 else 0.0
     
     weekday_conv_rate = (
-        (weekday_conversions["Revenue"].astype(str).str.upper() == "TRUE").sum() 
-        / len(weekday_conversions) * 100
-    ) if len(weekday_conversions) > 0 else 0.0
-    
-    visitor_type_conversion = {}
-    for visitor_type in df["VisitorType"].unique():
-        subset = df[df["VisitorType"] == visitor_type]
-        visitor_conversions = (subset["Revenue"].astype(str).str.upper() == "TRUE").sum()
-        visitor_rate = (visitor_conversions / len(subset) * 100) if len(subset) > 0 else 0.0
-        visitor_type_conversion[str(visitor_type)] = {
-            "sessions": int(len(subset)),
-            "conversion_rate": round(visitor_rate, 2)
-        }
+        float(revenue[~weekend].mean()) * 100
+    ) if weekday_sessions > 0 else 0.0
     
-    month_conversion = {}
-    for month in df["Month"].unique():
-        subset = df[df["Month"] == month]
-        month_conversions = (subset["Revenue"].astype(str).str.upper() == "TRUE").sum()
-        month_rate = (month_conversions / len(subset) * 100) if len(subset) > 0 else 0.0
-        month_conversion[str(month)] = {
-            "sessions": int(len(subset)),
-            "conversions": int(month_conversions),
-            "conversion_rate": round(month_rate, 2)
+    visitor_type_conversion = {
+        visitor_type: {
+            "sessions": stats["sessions"],
+            "conversion_rate": stats["conversion_rate"]
         }
+        for visitor_type, stats in _conversion_breakdown(revenue, df["VisitorType"]).items()
+    }
+    
+    month_conversion = _conversion_breakdown(revenue, df["Month"])
     
     top_months = sorted(
         month_conversion.items(),
@@ -135,6 +225,182 @@ def compute_basic_metrics(df: pd.DataFrame) -> Dict[str, Any]:
     }
 
 
+QUANTILE_COLUMNS = (
+    "BounceRates", "ExitRates", "PageValues",
+    "Administrative_Duration", "Informational_Duration", "ProductRelated_Duration"
+)
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+PAGE_TYPES = ("Administrative", "Informational", "ProductRelated")
+FUNNEL_STAGES = (
+    ("All sessions", None),
+    ("Viewed product pages", "ProductRelated"),
+    ("Viewed account pages", "Administrative"),
+    ("Purchased", "Revenue"),
+)
+EXTENDED_METRICS_CHUNK_SIZE = 50_000
+# Fixed so every worker, restart and cache reload reports the same quantiles
+EXTENDED_METRICS_SEED = 0x5E55
+
+
+class SessionMetricsAccumulator:
+    """
+    Mergeable accumulator for distribution quantiles and engagement funnel.
+    
+    Feed it row chunks with `update`, or build one per shard and combine
+    them with `merge`; `result` is the same either way (up to sketch error).
+    Quantiles come from KLL sketches, so no column is ever fully sorted.
+    Columns missing from the data are skipped. `seed` makes the sketches
+    reproducible (each column draws its own stream from it); leave it None
+    for shard accumulators that will be merged, or give each shard a
+    different seed.
+    
+    Engagement funnel stages are independent, not nested: the data has
+    page counts but no timestamps, so there is no observed order between
+    page types. Each stage of `FUNNEL_STAGES` counts every session that
+    meets its own condition, with the share of all sessions and the share
+    of those sessions that purchased. The last stage is therefore all
+    purchasers and matches `total_conversions`.
+    """
+    
+    def __init__(self, seed: Optional[int] = None):
+        import numpy as np
+        from app.services.quantile_sketch import KLLSketch
+        
+        seeds = np.random.SeedSequence(seed).spawn(len(QUANTILE_COLUMNS))
+        self.sessions = 0
+        self.sketches = {
+            col: KLLSketch(seed=col_seed) for col, col_seed in zip(QUANTILE_COLUMNS, seeds)
+        }
+        self.page_types = {
+            page_type: {"reached": 0, "pages": 0, "duration": 0.0, "conversions": 0}
+            for page_type in PAGE_TYPES
+        }
+        self.funnel = {
+            stage: {"sessions": 0, "conversions": 0} for stage, _ in FUNNEL_STAGES
+        }
+        self._seen_columns = set()
+    
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Accumulate one chunk of session rows."""
+        self.sessions += len(chunk)
+        self._seen_columns.update(chunk.columns)
+        revenue = _as_bool(chunk["Revenue"])
+        
+        for col, sketch in self.sketches.items():
+            if col in chunk.columns:
+                sketch.update(chunk[col].to_numpy())
+        
+        for page_type, totals in self.page_types.items():
+            if page_type not in chunk.columns:
+                continue
+            reached = chunk[page_type] > 0
+            totals["reached"] += int(reached.sum())
+            totals["pages"] += int(chunk[page_type].sum())
+            totals["conversions"] += int((reached & revenue).sum())
+            duration_col = f"{page_type}_Duration"
+            if duration_col in chunk.columns:
+                totals["duration"] += float(chunk[duration_col].to_numpy().sum(dtype="float64"))
+        
+        for stage, col in FUNNEL_STAGES:
+            if col is None:
+                reached = None
+            elif col in chunk.columns:
+                reached = revenue if col == "Revenue" else chunk[col] > 0
+            else:
+                continue
+            totals = self.funnel[stage]
+            totals["sessions"] += len(chunk) if reached is None else int(reached.sum())
+            totals["conversions"] += int(revenue.sum() if reached is None else (reached & revenue).sum())
+    
+    def merge(self, other: "SessionMetricsAccumulator") -> None:
+        """Fold another accumulator (e.g. from a different shard) into this one."""
+        self.sessions += other.sessions
+        self._seen_columns.update(other._seen_columns)
+        for col, sketch in self.sketches.items():
+            sketch.merge(other.sketches[col])
+        for page_type, totals in self.page_types.items():
+            for key in totals:
+                totals[key] += other.page_types[page_type][key]
+        for stage, totals in self.funnel.items():
+            for key in totals:
+                totals[key] += other.funnel[stage][key]
+    
+    def result(self) -> Dict[str, Any]:
+        """Return the extended metrics (JSON-serializable)."""
+        labels = list(QUANTILES)
+        distribution_quantiles = {}
+        for col, sketch in self.sketches.items():
+            if col in self._seen_columns and sketch.n > 0:
+                values = sketch.quantiles(list(QUANTILES.values()))
+                distribution_quantiles[col] = {
+                    label: round(value, 4) for label, value in zip(labels, values)
+                }
+        
+        page_type_engagement = {}
+        for page_type, totals in self.page_types.items():
+            if page_type not in self._seen_columns:
+                continue
+            reached = totals["reached"]
+            page_type_engagement[page_type] = {
+                "sessions_reached": reached,
+                "reach_rate": round(reached / self.sessions * 100, 2) if self.sessions else 0.0,
+                "avg_pages": round(totals["pages"] / reached, 2) if reached else 0.0,
+                "avg_duration_seconds": round(totals["duration"] / reached, 1) if reached else 0.0,
+                "conversion_rate": round(totals["conversions"] / reached * 100, 2) if reached else 0.0
+            }
+        
+        engagement_funnel = []
+        for stage, col in FUNNEL_STAGES:
+            if col is not None and col not in self._seen_columns:
+                continue
+            sessions = self.funnel[stage]["sessions"]
+            conversions = self.funnel[stage]["conversions"]
+            engagement_funnel.append({
+                "stage": stage,
+                "sessions": sessions,
+                "share_of_sessions": round(sessions / self.sessions * 100, 2) if self.sessions else 0.0,
+                "conversion_rate": round(conversions / sessions * 100, 2) if sessions else 0.0
+            })
+        
+        return {
+            "distribution_quantiles": distribution_quantiles,
+            "page_type_engagement": page_type_engagement,
+            "engagement_funnel": engagement_funnel
+        }
+
+
+def compute_extended_metrics(
+    df: pd.DataFrame,
+    chunk_size: int = EXTENDED_METRICS_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Calculate tail quantiles and the page-type engagement funnel.
+    
+    Rows are streamed through a `SessionMetricsAccumulator` in chunks of
+    `chunk_size`, so memory stays bounded and the same code path serves
+    chunked CSV reads or per-shard accumulators combined with `merge`.
+    The accumulator uses `EXTENDED_METRICS_SEED`, so the same data always
+    yields the same quantile estimates.
+    
+    Args:
+        df: DataFrame with e-commerce session data
+        chunk_size: Rows per accumulator update
+        
+    Returns:
+        Dictionary with distribution_quantiles, page_type_engagement and
+        engagement_funnel (JSON-serializable)
+    """
+    accumulator = SessionMetricsAccumulator(seed=EXTENDED_METRICS_SEED)
+    for start in range(0, len(df), chunk_size):
+        accumulator.update(df.iloc[start:start + chunk_size])
+    return accumulator.result()
+
+
+def compute_metrics(df: pd.DataFrame) -> Dict[str, Any]:
+    """Basic and extended metrics combined, as expected by `ComputedMetrics`."""
+    return {**compute_basic_metrics(df), **compute_extended_metrics(df)}
+
+
 def build_llm_context(df: pd.DataFrame, metrics: Dict[str, Any]) -> str:
     """
     Build structured context for LLM analysis.
@@ -186,6 +452,43 @@ def build_llm_context(df: pd.DataFrame, metrics: Dict[str, Any]) -> str:
             f"{stats['conversion_rate']}% conversion rate"
         )
     
+    quantiles = metrics.get("distribution_quantiles", {})
+    if quantiles:
+        context_parts.extend([
+            "",
+            "Distribution Tails (p50 / p90 / p99):"
+        ])
+        for col, values in quantiles.items():
+            context_parts.append(
+                f"  {col}: {values['p50']} / {values['p90']} / {values['p99']}"
+            )
+    
+    page_types = metrics.get("page_type_engagement", {})
+    if page_types:
+        context_parts.extend([
+            "",
+            "Page-Type Engagement:"
+        ])
+        for page_type, stats in page_types.items():
+            context_parts.append(
+                f"  {page_type}: reached by {stats['reach_rate']}% of sessions, "
+                f"{stats['avg_pages']} pages and {stats['avg_duration_seconds']}s on average, "
+                f"{stats['conversion_rate']}% conversion"
+            )
+    
+    funnel = metrics.get("engagement_funnel", [])
+    if funnel:
+        context_parts.extend([
+            "",
+            "Engagement Funnel (independent stages, not a sequence):"
+        ])
+        for step in funnel:
+            context_parts.append(
+                f"  {step['stage']}: {step['sessions']:,} sessions "
+                f"({step['share_of_sessions']}% of all sessions, "
+                f"{step['conversion_rate']}% of them purchased)"
+            )
+    
     context_parts.extend([
         "",
         "Notable Observations:",
@@ -201,7 +504,8 @@ def build_llm_context(df: pd.DataFrame, metrics: Dict[str, Any]) -> str:
 async def generate_ux_insights(
     mistral_client: MistralClient,
     df: pd.DataFrame,
-    prompt_template: str
+    prompt_template: str,
+    metrics_dict: Optional[Dict[str, Any]] = None
 ) -> UXInsightsResponse:
     """
     Generate structured UX insights using Mistral AI.
@@ -213,6 +517,7 @@ async def generate_ux_insights(
         mistral_client: Configured Mistral API client
         df: E-commerce session DataFrame
         prompt_template: Template string with {context} placeholder
+        metrics_dict: Pre-computed `compute_metrics(df)` output, if cached
         
     Returns:
         Validated UXInsightsResponse with insights and metrics
@@ -220,10 +525,11 @@ async def generate_ux_insights(
     Raises:
         AnalysisError: If metrics computation or LLM generation fails
     """
-    try:
-        metrics_dict = compute_basic_metrics(df)
-    except Exception as e:
-        raise AnalysisError(f"Failed to compute metrics: {str(e)}")
+    if metrics_dict is None:
+        try:
+            metrics_dict = compute_metrics(df)
+        except Exception as e:
+            raise AnalysisError(f"Failed to compute metrics: {str(e)}")
     
     context = build_llm_context(df, metrics_dict)
     
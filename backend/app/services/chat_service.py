@@ -0,0 +1,282 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from app.core.config import get_settings
+from app.schemas.analysis import UXInsightsResponse
+
+
+class ChatSessionNotFoundError(Exception):
+    """Raised when a session_id is unknown or its TTL has expired."""
+    pass
+
+
+def build_insights_context(insights_response: UXInsightsResponse) -> str:
+    """
+    Build a text context from UXInsightsResponse for chat prompt injection.
+    
+    Args:
+        insights_response: UXInsightsResponse with insights and metrics
+        
+    Returns:
+        Formatted string with summary, insights, and key metrics
+    """
+    context_parts = [
+        "## Executive Summary",
+        insights_response.summary,
+        "",
+        "## UX Insights",
+        ""
+    ]
+    
+    for insight in insights_response.insights:
+        context_parts.extend([
+            f"### {insight.title} (Severity: {insight.severity})",
+            f"- **ID**: {insight.id}",
+            f"- **Evidence**: {insight.metric_evidence}",
+            f"- **Hypothesis**: {insight.hypothesized_cause}",
+            f"- **Recommendation**: {insight.recommendation}",
+            f"- **Target Segment**: {insight.target_segment}",
+            ""
+        ])
+    
+    context_parts.extend([
+        "## Key Metrics",
+        f"- Total Sessions: {insights_response.metrics.total_sessions:,}",
+        f"- Total Conversions: {insights_response.metrics.total_conversions:,}",
+        f"- Conversion Rate: {insights_response.metrics.conversion_rate}%",
+        f"- Average Bounce Rate: {insights_response.metrics.avg_bounce_rate:.2%}",
+        f"- Average Exit Rate: {insights_response.metrics.avg_exit_rate:.2%}",
+        f"- Weekend Conversion Rate: {insights_response.metrics.weekend_conversion_rate}%",
+        f"- Weekday Conversion Rate: {insights_response.metrics.weekday_conversion_rate}%",
+        ""
+    ])
+    
+    return "\n".join(context_parts)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token) used for history budgeting.
+    
+    Avoids shipping a tokenizer; it only needs to be monotonic and roughly
+    proportional to the model's count.
+    """
+    return len(text) // 4 + 1
+
+
+class InsightsSnapshot:
+    """
+    One published version of a dataset's insights.
+    
+    The chat system prompt is rendered once per snapshot and reused by
+    every session and turn that refers to it. `dataset_version` is the
+    registry snapshot version the insights were computed from (None when
+    datasets are not versioned).
+    """
+    
+    def __init__(
+        self,
+        dataset_id: str,
+        version: int,
+        insights: UXInsightsResponse,
+        dataset_version: Optional[int] = None
+    ):
+        self.dataset_id = dataset_id
+        self.version = version
+        self.insights = insights
+        self.dataset_version = dataset_version
+        self._system_prompt: Optional[str] = None
+        self._lock = threading.Lock()
+    
+    def system_prompt(self, chat_prompt_template: str) -> str:
+        """
+        Return the chat template with this snapshot's insights filled in.
+        
+        Args:
+            chat_prompt_template: Template with an {insights_context} placeholder
+        """
+        with self._lock:
+            if self._system_prompt is None:
+                self._system_prompt = chat_prompt_template.replace(
+                    "{insights_context}", build_insights_context(self.insights)
+                )
+            return self._system_prompt
+
+
+class ChatSession:
+    """Server-side conversation pinned to one insights snapshot."""
+    
+    def __init__(self, session_id: str, snapshot: InsightsSnapshot, expires_at: float):
+        self.session_id = session_id
+        self.snapshot = snapshot
+        self.messages: List[Dict[str, str]] = []
+        self.expires_at = expires_at
+    
+    @property
+    def dataset_id(self) -> str:
+        return self.snapshot.dataset_id
+
+
+class ChatSessionStore:
+    """
+    In-process store for chat sessions and the latest insights per dataset.
+    
+    Sessions expire `ttl_seconds` after their last use and the oldest are
+    dropped beyond `max_sessions`. Each session keeps at most
+    `max_messages` messages; older ones are discarded as turns are added.
+    """
+    
+    def __init__(self, ttl_seconds: int, max_sessions: int, max_messages: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._snapshots: Dict[str, InsightsSnapshot] = {}
+        self._lock = threading.Lock()
+    
+    def publish_insights(
+        self,
+        dataset_id: str,
+        insights: UXInsightsResponse,
+        dataset_version: Optional[int] = None
+    ) -> InsightsSnapshot:
+        """
+        Record freshly generated insights as the latest version for a dataset.
+        
+        Existing sessions keep the snapshot they started with.
+        
+        Args:
+            dataset_id: Dataset the insights describe
+            insights: Generated insights
+            dataset_version: Registry version the insights were computed
+                from; read it before loading the data, so a concurrent swap
+                can only make the snapshot look stale, never fresh
+        """
+        with self._lock:
+            previous = self._snapshots.get(dataset_id)
+            version = previous.version + 1 if previous else 1
+            snapshot = InsightsSnapshot(dataset_id, version, insights, dataset_version)
+            self._snapshots[dataset_id] = snapshot
+            return snapshot
+    
+    def latest_insights(
+        self,
+        dataset_id: str,
+        dataset_version: Optional[int] = None
+    ) -> Optional[InsightsSnapshot]:
+        """
+        Return the latest insights for a dataset, or None if there are none
+        or they were computed from a different dataset version.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(dataset_id)
+            if snapshot is None or snapshot.dataset_version != dataset_version:
+                return None
+            return snapshot
+    
+    def create_session(self, snapshot: InsightsSnapshot) -> ChatSession:
+        with self._lock:
+            self._evict_expired()
+            session = ChatSession(
+                session_id=uuid.uuid4().hex,
+                snapshot=snapshot,
+                expires_at=time.monotonic() + self.ttl_seconds
+            )
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return session
+    
+    def get_session(self, session_id: str) -> ChatSession:
+        """
+        Return a live session and extend its TTL.
+        
+        Raises:
+            ChatSessionNotFoundError: If the session is unknown or expired
+        """
+        with self._lock:
+            self._evict_expired()
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise ChatSessionNotFoundError(
+                    f"Chat session not found or expired: {session_id}"
+                )
+            session.expires_at = time.monotonic() + self.ttl_seconds
+            self._sessions.move_to_end(session_id)
+            return session
+    
+    def record_turn(self, session: ChatSession, question: str, answer: str) -> None:
+        """Append a question/answer pair, dropping the oldest pair if over the bound."""
+        with self._lock:
+            session.messages.append({"role": "user", "content": question})
+            session.messages.append({"role": "assistant", "content": answer})
+            overflow = len(session.messages) - self.max_messages
+            if overflow > 0:
+                del session.messages[:overflow + overflow % 2]
+    
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, session in self._sessions.items() if session.expires_at <= now]
+        for key in expired:
+            del self._sessions[key]
+
+
+def build_chat_messages(
+    session: ChatSession,
+    system_prompt: str,
+    question: str,
+    history_token_budget: int
+) -> List[Dict[str, str]]:
+    """
+    Assemble the message list for one chat turn.
+    
+    The cached system prompt comes first, then as many of the most recent
+    history messages as fit in `history_token_budget`, then the new question.
+    History is trimmed from the oldest end so it always starts on a user turn.
+    
+    Args:
+        session: Session whose history to include
+        system_prompt: Pre-rendered system/context prefix
+        question: The new user message
+        history_token_budget: Maximum estimated tokens of history to send
+        
+    Returns:
+        List of {"role", "content"} messages for the chat completion API
+    """
+    history: List[Dict[str, str]] = []
+    used = 0
+    for message in reversed(session.messages):
+        cost = estimate_tokens(message["content"])
+        if used + cost > history_token_budget:
+            break
+        history.append(message)
+        used += cost
+    history.reverse()
+    
+    while history and history[0]["role"] != "user":
+        history.pop(0)
+    
+    return [
+        {"role": "system", "content": system_prompt},
+        *history,
+        {"role": "user", "content": question}
+    ]
+
+
+@lru_cache(maxsize=1)
+def get_chat_session_store() -> ChatSessionStore:
+    """
+    Return the process-wide chat session store.
+    
+    Uses the CHAT_* limits from application settings.
+    """
+    settings = get_settings()
+    return ChatSessionStore(
+        ttl_seconds=settings.chat_session_ttl_seconds,
+        max_sessions=settings.chat_max_sessions,
+        max_messages=settings.chat_max_history_messages
+    )
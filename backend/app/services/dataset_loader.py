@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from app.core.config import DATASETS_DIR, get_settings
+from app.services.analysis_service import (
+    load_dataset,
+    compute_metrics,
+    memory_footprint,
+    DatasetError,
+    AnalysisError
+)
+from app.services.shared_dataset import SharedDatasetStore, default_shared_dir
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+SUPPORTED_SUFFIXES = (".csv",)
+
+
+class DatasetNotFoundError(DatasetError):
+    """Raised when a dataset_id does not match any file under `datasets/`."""
+    pass
+
+
+class _CachedDataset:
+    """A loaded frame plus its derived aggregates and their memory cost."""
+
+    def __init__(self, frame: pd.DataFrame, version: Optional[int] = None):
+        self.frame = frame
+        self.version = version
+        self.metrics: Optional[Dict[str, Any]] = None
+        self.frame_bytes = int(frame.memory_usage(deep=True).sum())
+        self.metrics_bytes = 0
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.frame_bytes + self.metrics_bytes
+
+
+class DatasetRegistry:
+    """
+    Registry of every dataset file under `datasets/`, keyed by file stem.
+
+    Loaded frames and their computed metrics are held in an LRU cache whose
+    total size is bounded by `memory_budget_bytes`. When a load pushes the
+    total over budget, least recently used datasets are evicted until it
+    fits again; the dataset just requested is never evicted, so a single
+    file larger than the budget is still served (alone).
+
+    With a `shared_store`, frames are attached zero-copy to memory-mapped
+    snapshots shared by all worker processes instead of parsed per process.
+    Each access checks the snapshot version and re-attaches after a swap.
+
+    All methods are thread-safe but blocking; call them from async handlers
+    through `asyncio.to_thread`. The registry lock only guards the cache
+    bookkeeping: parsing (or attaching) a dataset and computing its metrics
+    run under a per-dataset load lock, so a slow load never delays lookups
+    of other datasets, and concurrent requests for the same dataset wait
+    for a single load instead of repeating it. Cached frames are shared
+    and read-only.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        memory_budget_bytes: int,
+        shared_store: Optional[SharedDatasetStore] = None
+    ):
+        self.root = root
+        self.memory_budget_bytes = memory_budget_bytes
+        self.shared_store = shared_store
+        self._paths: Dict[str, Path] = {}
+        self._cache: "OrderedDict[str, _CachedDataset]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._evictions = 0
+        self._lock = threading.RLock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.discover()
+
+    def discover(self) -> List[str]:
+        """
+        Rescan the datasets directory for supported files.
+
+        Returns:
+            Sorted list of available dataset IDs
+        """
+        paths = {}
+        if self.root.is_dir():
+            for path in self.root.iterdir():
+                if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES:
+                    paths[path.stem] = path
+
+        with self._lock:
+            self._paths = paths
+            for dataset_id in paths:
+                self._stats.setdefault(
+                    dataset_id, {"hits": 0, "loads": 0, "evictions": 0}
+                )
+            return sorted(paths)
+
+    def dataset_ids(self) -> List[str]:
+        with self._lock:
+            return sorted(self._paths)
+
+    def dataset_path(self, dataset_id: str) -> Path:
+        """
+        Return the source file of `dataset_id`, rescanning once if unknown.
+
+        Raises:
+            DatasetNotFoundError: If no file matches `dataset_id`
+        """
+        with self._lock:
+            path = self._paths.get(dataset_id)
+            if path is None and dataset_id in self.discover():
+                path = self._paths[dataset_id]
+            if path is None:
+                raise DatasetNotFoundError(
+                    f"Unknown dataset_id '{dataset_id}'. "
+                    f"Available: {', '.join(self.dataset_ids()) or 'none'}"
+                )
+            return path
+
+    def dataset_version(self, dataset_id: str) -> Optional[int]:
+        """
+        Return the live snapshot version of `dataset_id`, publishing it if stale.
+
+        Only shared storage versions datasets; with process storage this
+        always returns None.
+
+        Raises:
+            DatasetNotFoundError: If no file matches `dataset_id`
+            DatasetError: If a changed source cannot be published
+        """
+        path = self.dataset_path(dataset_id)
+        if self.shared_store is None:
+            return None
+        return self.shared_store.ensure_published(dataset_id, path)
+
+    def get_frame(self, dataset_id: str) -> pd.DataFrame:
+        """
+        Return the DataFrame for `dataset_id`, loading it on a cache miss.
+
+        Raises:
+            DatasetNotFoundError: If no file matches `dataset_id`
+            DatasetError: If the file cannot be loaded or validated
+        """
+        return self._get_entry(dataset_id).frame
+
+    def get_metrics(self, dataset_id: str) -> Dict[str, Any]:
+        """
+        Return `compute_metrics` for `dataset_id`, computed once per load.
+
+        The aggregates are evicted together with their frame.
+
+        Raises:
+            DatasetNotFoundError: If no file matches `dataset_id`
+            DatasetError: If the file cannot be loaded or validated
+            AnalysisError: If metrics computation fails
+        """
+        return self._get_entry_with_metrics(dataset_id).metrics
+
+    def get_frame_and_metrics(self, dataset_id: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Return the DataFrame and metrics of `dataset_id` from a single lookup.
+
+        Prefer this over `get_frame` followed by `get_metrics`: both values
+        come from the same cache entry, so in shared mode they always belong
+        to the same snapshot version, and the version check runs only once.
+
+        Raises:
+            DatasetNotFoundError: If no file matches `dataset_id`
+            DatasetError: If the file cannot be loaded or validated
+            AnalysisError: If metrics computation fails
+        """
+        entry = self._get_entry_with_metrics(dataset_id)
+        return entry.frame, entry.metrics
+
+    def memory_report(self, dataset_id: str) -> Dict[str, Any]:
+        """
+        Return the per-column memory footprint of `dataset_id`, loading it if needed.
+
+        Raises:
+            DatasetNotFoundError: If no file matches `dataset_id`
+            DatasetError: If the file cannot be loaded or validated
+        """
+        return {"dataset_id": dataset_id, **memory_footprint(self.get_frame(dataset_id))}
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-dataset memory and cache counters plus registry totals."""
+        with self._lock:
+            datasets = {}
+            for dataset_id in sorted(self._paths):
+                entry = self._cache.get(dataset_id)
+                datasets[dataset_id] = {
+                    "loaded": entry is not None,
+                    "version": entry.version if entry else None,
+                    "memory_bytes": entry.memory_bytes if entry else 0,
+                    **self._stats[dataset_id]
+                }
+            return {
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "memory_used_bytes": self._used_bytes(),
+                "evictions": self._evictions,
+                "datasets": datasets
+            }
+
+    def _get_entry(self, dataset_id: str) -> _CachedDataset:
+        version = self.dataset_version(dataset_id)
+        entry = self._cached_entry(dataset_id, version)
+        if entry is not None:
+            return entry
+
+        with self._load_lock(dataset_id):
+            # Another thread may have finished loading while we waited
+            entry = self._cached_entry(dataset_id, version)
+            if entry is not None:
+                return entry
+
+            if self.shared_store is not None:
+                frame = self.shared_store.attach(dataset_id, version)
+            else:
+                frame = load_dataset(str(self.dataset_path(dataset_id)))
+            entry = _CachedDataset(frame, version)
+
+            with self._lock:
+                self._cache[dataset_id] = entry
+                self._stats[dataset_id]["loads"] += 1
+                self._evict_over_budget(keep=dataset_id)
+            return entry
+
+    def _get_entry_with_metrics(self, dataset_id: str) -> _CachedDataset:
+        entry = self._get_entry(dataset_id)
+        if entry.metrics is None:
+            with self._load_lock(dataset_id):
+                if entry.metrics is None:
+                    try:
+                        metrics = compute_metrics(entry.frame)
+                    except Exception as e:
+                        raise AnalysisError(f"Failed to compute metrics: {str(e)}")
+                    metrics_bytes = len(json.dumps(metrics))
+
+                    with self._lock:
+                        entry.metrics = metrics
+                        entry.metrics_bytes = metrics_bytes
+                        if self._cache.get(dataset_id) is entry:
+                            self._evict_over_budget(keep=dataset_id)
+        return entry
+
+    def _cached_entry(self, dataset_id: str, version: Optional[int]) -> Optional[_CachedDataset]:
+        with self._lock:
+            entry = self._cache.get(dataset_id)
+            if entry is None:
+                return None
+            if entry.version != version:
+                del self._cache[dataset_id]
+                return None
+            self._cache.move_to_end(dataset_id)
+            self._stats[dataset_id]["hits"] += 1
+            return entry
+
+    def _load_lock(self, dataset_id: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(dataset_id, threading.Lock())
+
+    def _used_bytes(self) -> int:
+        return sum(entry.memory_bytes for entry in self._cache.values())
+
+    def _evict_over_budget(self, keep: str) -> None:
+        while self._used_bytes() > self.memory_budget_bytes:
+            victim = next((key for key in self._cache if key != keep), None)
+            if victim is None:
+                break
+            del self._cache[victim]
+            self._stats[victim]["evictions"] += 1
+            self._evictions += 1
+
+
+@lru_cache(maxsize=1)
+def get_dataset_registry() -> DatasetRegistry:
+    """
+    Return the process-wide dataset registry.
+
+    Uses DATASET_MEMORY_BUDGET_MB and DATASET_STORAGE from application settings.
+    """
+    settings = get_settings()
+    shared_store = None
+    if settings.dataset_storage == "shared":
+        shared_store = SharedDatasetStore(settings.shared_dataset_dir or default_shared_dir())
+
+    return DatasetRegistry(
+        root=DATASETS_DIR,
+        memory_budget_bytes=settings.dataset_memory_budget_mb * 1024 * 1024,
+        shared_store=shared_store
+    )
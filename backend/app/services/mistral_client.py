@@ -1,7 +1,10 @@
-import httpx
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from app.core.config import settings
+from app.core.config import get_settings
+
+if TYPE_CHECKING:
+    import httpx
 
 
 class MistralClientError(Exception):
@@ -15,6 +18,9 @@ class MistralClient:
     
     Handles HTTP communication, error management, and response parsing.
     Does not contain business logic or prompt engineering.
+    
+    A single pooled `httpx.AsyncClient` is reused across calls; it is opened
+    lazily on first use (or explicitly via `open()` during warm-up).
     """
     
     def __init__(
@@ -27,6 +33,26 @@ class MistralClient:
         self.model_id = model_id
         self.base_url = base_url.rstrip("/")
         self.endpoint = f"{self.base_url}/chat/completions"
+        self._http_client: Optional["httpx.AsyncClient"] = None
+    
+    def open(self) -> "httpx.AsyncClient":
+        """
+        Open the pooled HTTP client if it is not already open.
+        
+        Returns:
+            The shared httpx.AsyncClient instance
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            import httpx
+            
+            self._http_client = httpx.AsyncClient(timeout=30.0)
+        return self._http_client
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client and release its connections."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
         
     async def generate_completion(
         self,
@@ -45,6 +71,32 @@ class MistralClient:
         Returns:
             The generated text content from the model
             
+        Raises:
+            MistralClientError: If the API returns an error or network fails
+        """
+        return await self.generate_chat_completion(
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+    
+    async def generate_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: int = 800
+    ) -> str:
+        """
+        Generate the next assistant message for a multi-message conversation.
+        
+        Args:
+            messages: Ordered {"role", "content"} messages (system, user, assistant)
+            temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+            max_tokens: Maximum tokens in the response
+            
+        Returns:
+            The generated text content from the model
+            
         Raises:
             MistralClientError: If the API returns an error or network fails
         """
@@ -55,30 +107,31 @@ class MistralClient:
         
         payload = {
             "model": self.model_id,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
+            "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens
         }
         
+        import httpx
+        
+        client = self.open()
+        
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.endpoint,
-                    headers=headers,
-                    json=payload
+            response = await client.post(
+                self.endpoint,
+                headers=headers,
+                json=payload
+            )
+            
+            if response.status_code != 200:
+                error_detail = response.text
+                raise MistralClientError(
+                    f"Mistral API error (status {response.status_code}): {error_detail}"
                 )
-                
-                if response.status_code != 200:
-                    error_detail = response.text
-                    raise MistralClientError(
-                        f"Mistral API error (status {response.status_code}): {error_detail}"
-                    )
-                
-                data = response.json()
-                return self._extract_content(data)
-                
+            
+            data = response.json()
+            return self._extract_content(data)
+            
         except httpx.RequestError as e:
             raise MistralClientError(f"Network error while calling Mistral API: {str(e)}")
         except KeyError as e:
@@ -93,12 +146,15 @@ class MistralClient:
         return response_data["choices"][0]["message"]["content"]
 
 
+@lru_cache(maxsize=1)
 def get_mistral_client() -> MistralClient:
     """
-    Factory function to create a configured MistralClient instance.
+    Return the shared, configured MistralClient instance.
     
-    Uses application settings from environment variables.
+    Uses application settings from environment variables. The instance is
+    cached so every request reuses the same HTTP connection pool.
     """
+    settings = get_settings()
     return MistralClient(
         api_key=settings.mistral_api_key,
         model_id=settings.mistral_model_id,
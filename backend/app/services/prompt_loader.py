@@ -0,0 +1,37 @@
+from functools import lru_cache
+
+from app.core.config import PROMPTS_DIR
+
+
+ANALYSIS_PROMPT_NAME = "ux_analysis_prompt.md"
+CHAT_PROMPT_NAME = "ux_chat_prompt.md"
+
+
+class PromptError(Exception):
+    """Raised when a prompt template is missing or unreadable."""
+    pass
+
+
+@lru_cache(maxsize=None)
+def get_prompt_template(name: str) -> str:
+    """
+    Read a prompt template from the prompts directory, once per process.
+    
+    Args:
+        name: File name inside `prompts/` (e.g. "ux_analysis_prompt.md")
+        
+    Returns:
+        The raw template text
+        
+    Raises:
+        PromptError: If the file is missing or cannot be read
+    """
+    path = PROMPTS_DIR / name
+    
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise PromptError(f"Prompt template not found: {path}")
+    except Exception as e:
+        raise PromptError(f"Failed to load prompt template: {str(e)}")
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
+
+from app.services.analysis_service import load_dataset, DatasetError
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+MANIFEST_NAME = "manifest.json"
+CURRENT_NAME = "CURRENT"
+LOCK_NAME = ".lock"
+
+
+class SharedDatasetStore:
+    """
+    Publishes datasets as memory-mapped column files and attaches to them.
+
+    Layout under `root`::
+
+        <dataset_id>/
+            .lock            # flock held while publishing
+            CURRENT          # version number of the live snapshot
+            v<N>/
+                manifest.json
+                000.npy ...  # one file per column
+
+    Publishing writes a new `v<N>` directory and then swaps `CURRENT` with
+    `os.replace`, so readers never observe a partial snapshot. Workers
+    attach with `np.load(mmap_mode="r")`: the OS page cache holds a single
+    copy of the column data however many processes map it. Categorical
+    columns store their integer codes as the array and their categories in
+    the manifest.
+
+    The first process that needs a dataset (or finds its source CSV changed
+    since the live snapshot) publishes it under an exclusive file lock;
+    every other process waits on the lock and then attaches to the result.
+    Uses `fcntl.flock`, so shared mode is POSIX-only.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._fingerprints: Dict[Tuple[str, int], Dict[str, int]] = {}
+
+    def current_version(self, dataset_id: str) -> Optional[int]:
+        """Return the live snapshot version, or None if never published."""
+        try:
+            return int((self.root / dataset_id / CURRENT_NAME).read_text().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def ensure_published(self, dataset_id: str, source: Path) -> int:
+        """
+        Return the live version for `dataset_id`, publishing it first if the
+        snapshot is missing or older than `source`.
+
+        Raises:
+            DatasetError: If the source cannot be loaded
+        """
+        version = self.current_version(dataset_id)
+        if version is not None and self._is_fresh(dataset_id, version, source):
+            return version
+
+        with self._locked(dataset_id):
+            version = self.current_version(dataset_id)
+            if version is not None and self._is_fresh(dataset_id, version, source):
+                return version
+            return self._publish_locked(dataset_id, source, version)
+
+    def publish(self, dataset_id: str, source: Path) -> int:
+        """
+        Unconditionally publish a new snapshot of `source` and make it live.
+
+        Returns:
+            The new version number
+        """
+        with self._locked(dataset_id):
+            return self._publish_locked(dataset_id, source, self.current_version(dataset_id))
+
+    def attach(self, dataset_id: str, version: int) -> pd.DataFrame:
+        """
+        Map snapshot `version` into this process as a read-only DataFrame.
+
+        Column data, including categorical codes, is not copied: the frame's
+        arrays are read-only views of the mapped files. The codes were
+        validated at publish time and are not re-scanned here.
+
+        Raises:
+            DatasetError: If the snapshot is missing or corrupt
+        """
+        import numpy as np
+        import pandas as pd
+
+        version_dir = self.root / dataset_id / f"v{version}"
+
+        try:
+            manifest = json.loads((version_dir / MANIFEST_NAME).read_text())
+            columns = {}
+            for column in manifest["columns"]:
+                values = np.load(version_dir / column["file"], mmap_mode="r")
+                if column["categories"] is not None:
+                    # validate=False skips a full pass over the codes, and the
+                    # stored codes already have the width pandas would pick
+                    values = pd.Categorical.from_codes(
+                        values,
+                        dtype=pd.CategoricalDtype(column["categories"]),
+                        validate=False
+                    )
+                columns[column["name"]] = values
+        except (OSError, ValueError, KeyError) as e:
+            raise DatasetError(f"Failed to attach shared dataset {dataset_id} v{version}: {str(e)}")
+
+        return pd.DataFrame(columns, copy=False)
+
+    def _publish_locked(self, dataset_id: str, source: Path, previous: Optional[int]) -> int:
+        import numpy as np
+        import pandas as pd
+
+        df = load_dataset(str(source))
+        version = (previous or 0) + 1
+        dataset_dir = self.root / dataset_id
+        version_dir = dataset_dir / f"v{version}"
+        staging_dir = dataset_dir / f"v{version}.tmp-{os.getpid()}"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+
+        columns = []
+        for index, name in enumerate(df.columns):
+            series = df[name]
+            is_categorical = isinstance(series.dtype, pd.CategoricalDtype)
+            if not is_categorical and series.to_numpy().dtype == object:
+                # Strings cannot be mapped zero-copy; store them as category codes
+                series = series.astype("category")
+
+            categories = None
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                categories = [str(value) for value in series.cat.categories]
+                values = series.cat.codes.to_numpy()
+            else:
+                values = series.to_numpy()
+
+            file_name = f"{index:03d}.npy"
+            np.save(staging_dir / file_name, values, allow_pickle=False)
+            columns.append({"name": str(name), "file": file_name, "categories": categories})
+
+        stat = source.stat()
+        manifest = {
+            "dataset_id": dataset_id,
+            "version": version,
+            "rows": len(df),
+            "source": {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size},
+            "columns": columns
+        }
+        (staging_dir / MANIFEST_NAME).write_text(json.dumps(manifest))
+
+        shutil.rmtree(version_dir, ignore_errors=True)
+        os.rename(staging_dir, version_dir)
+
+        current_tmp = dataset_dir / f"{CURRENT_NAME}.tmp-{os.getpid()}"
+        current_tmp.write_text(str(version))
+        os.replace(current_tmp, dataset_dir / CURRENT_NAME)
+
+        # Keep the previous snapshot for readers mid-attach; older ones can go.
+        # Already-mapped files stay valid after unlink on POSIX.
+        for child in dataset_dir.iterdir():
+            if child.is_dir() and child.name.startswith("v") and child.name[1:].isdigit():
+                if int(child.name[1:]) < version - 1:
+                    shutil.rmtree(child, ignore_errors=True)
+
+        return version
+
+    def _is_fresh(self, dataset_id: str, version: int, source: Path) -> bool:
+        key = (dataset_id, version)
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            manifest_path = self.root / dataset_id / f"v{version}" / MANIFEST_NAME
+            try:
+                fingerprint = json.loads(manifest_path.read_text())["source"]
+            except (OSError, ValueError, KeyError):
+                return False
+            self._fingerprints[key] = fingerprint
+
+        try:
+            stat = source.stat()
+        except OSError:
+            return True
+        return fingerprint == {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    @contextmanager
+    def _locked(self, dataset_id: str) -> Iterator[None]:
+        import fcntl
+
+        dataset_dir = self.root / dataset_id
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        with open(dataset_dir / LOCK_NAME, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def default_shared_dir() -> Path:
+    """`/dev/shm/insightchat-datasets` when available, else the temp directory."""
+    import tempfile
+
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() else Path(tempfile.gettempdir())
+    return base / "insightchat-datasets"
+
+
+if __name__ == "__main__":
+    # Publish snapshots ahead of starting workers:
+    #   python -m app.services.shared_dataset [dataset_id ...]
+    from app.core.config import get_settings
+    from app.services.dataset_loader import get_dataset_registry
+
+    registry = get_dataset_registry()
+    store = SharedDatasetStore(get_settings().shared_dataset_dir or default_shared_dir())
+    for dataset_id in sys.argv[1:] or registry.dataset_ids():
+        version = store.publish(dataset_id, registry.dataset_path(dataset_id))
+        print(f"{dataset_id}: v{version} -> {store.root / dataset_id}")
@@ -0,0 +1,70 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+from app.core.config import get_settings
+from app.services.dataset_loader import get_dataset_registry
+from app.services.mistral_client import get_mistral_client
+from app.services.prompt_loader import (
+    get_prompt_template,
+    ANALYSIS_PROMPT_NAME,
+    CHAT_PROMPT_NAME
+)
+
+
+class WarmupState:
+    """
+    Readiness bookkeeping for the startup warm-up.
+
+    `/health` reports liveness only; `/ready` reports this state so load
+    balancers can hold traffic until the caches are populated.
+    """
+
+    def __init__(self):
+        self.ready: bool = False
+        self.error: Optional[str] = None
+        self.timings_ms: Dict[str, float] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "error": self.error,
+            "timings_ms": dict(self.timings_ms)
+        }
+
+
+warmup_state = WarmupState()
+
+
+async def warm_up(state: WarmupState = warmup_state) -> None:
+    """
+    Populate the dataset, prompt and HTTP pool caches before traffic arrives.
+
+    Each step runs in a worker thread so the event loop keeps serving
+    `/health` meanwhile. A failing step is recorded on `state.error` and
+    the remaining steps still run; the affected resource is then loaded
+    lazily by the first request that needs it. `state.ready` is set once
+    every step has been attempted, whether or not all of them succeeded.
+    """
+    steps = [
+        ("dataset", lambda: get_dataset_registry().get_metrics(
+            get_settings().default_dataset_id
+        )),
+        ("analysis_prompt", lambda: get_prompt_template(ANALYSIS_PROMPT_NAME)),
+        ("chat_prompt", lambda: get_prompt_template(CHAT_PROMPT_NAME)),
+        ("http_pool", lambda: get_mistral_client().open()),
+    ]
+
+    errors = []
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(step)
+        except Exception as e:
+            errors.append(f"{name}: {str(e)}")
+            continue
+        state.timings_ms[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    state.error = "; ".join(errors) or None
+
+    state.ready = True
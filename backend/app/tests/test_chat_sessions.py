@@ -0,0 +1,116 @@
+import pytest
+
+from app.schemas.analysis import UXInsightsResponse
+from app.services import chat_service
+from app.services.chat_service import (
+    ChatSessionStore,
+    ChatSessionNotFoundError,
+    build_chat_messages,
+    estimate_tokens
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(chat_service, "time", clock)
+    return clock
+
+
+def make_store(**limits) -> ChatSessionStore:
+    return ChatSessionStore(**{"ttl_seconds": 10, "max_sessions": 10, "max_messages": 4, **limits})
+
+
+def make_session(store: ChatSessionStore, dataset_id: str = "sessions"):
+    snapshot = store.publish_insights(dataset_id, UXInsightsResponse.model_construct(summary=dataset_id))
+    return store.create_session(snapshot)
+
+
+def test_sessions_expire_after_ttl_since_last_use(clock):
+    store = make_store(ttl_seconds=10)
+    session = make_session(store)
+
+    clock.now = 8
+    assert store.get_session(session.session_id) is session
+    clock.now = 17
+    assert store.get_session(session.session_id) is session
+
+    clock.now = 27
+    with pytest.raises(ChatSessionNotFoundError):
+        store.get_session(session.session_id)
+
+
+def test_least_recently_used_session_is_dropped_over_max(clock):
+    store = make_store(max_sessions=2)
+    first = make_session(store)
+    second = make_session(store)
+
+    store.get_session(first.session_id)
+    make_session(store)
+
+    assert store.get_session(first.session_id) is first
+    with pytest.raises(ChatSessionNotFoundError):
+        store.get_session(second.session_id)
+
+
+@pytest.mark.parametrize("max_messages, expected", [
+    (3, ["q3", "a3"]),
+    (4, ["q2", "a2", "q3", "a3"]),
+])
+def test_history_is_trimmed_by_whole_turns(clock, max_messages, expected):
+    store = make_store(max_messages=max_messages)
+    session = make_session(store)
+
+    for turn in (1, 2, 3):
+        store.record_turn(session, f"q{turn}", f"a{turn}")
+
+    assert [message["content"] for message in session.messages] == expected
+    assert session.messages[0]["role"] == "user"
+
+
+def test_chat_messages_fit_budget_and_start_on_user_turn(clock):
+    store = make_store(max_messages=10)
+    session = make_session(store)
+    store.record_turn(session, "q1", "a1")
+    store.record_turn(session, "q2 " + "x" * 400, "a2")
+
+    # Room for "a2" but not for its long question: the orphaned answer is dropped too
+    budget = estimate_tokens("a2") + 1
+    messages = build_chat_messages(session, "system", "q3", history_token_budget=budget)
+    assert [message["content"] for message in messages] == ["system", "q3"]
+
+    messages = build_chat_messages(session, "system", "q3", history_token_budget=1_000)
+    assert [message["role"] for message in messages] == [
+        "system", "user", "assistant", "user", "assistant", "user"
+    ]
+    assert messages[-1]["content"] == "q3"
+
+
+def test_published_insights_are_versioned(clock):
+    store = make_store()
+    session = make_session(store)
+
+    latest = store.publish_insights("sessions", UXInsightsResponse.model_construct(summary="new"))
+
+    assert session.snapshot.version == 1
+    assert latest.version == 2
+    assert store.latest_insights("sessions") is latest
+    assert store.latest_insights("other") is None
+
+
+def test_insights_from_another_dataset_version_are_stale(clock):
+    store = make_store()
+    snapshot = store.publish_insights(
+        "sessions", UXInsightsResponse.model_construct(summary="v1"), dataset_version=1
+    )
+
+    assert store.latest_insights("sessions", dataset_version=1) is snapshot
+    assert store.latest_insights("sessions", dataset_version=2) is None
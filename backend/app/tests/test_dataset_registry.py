@@ -0,0 +1,83 @@
+import pytest
+
+from app.core.config import DATASETS_DIR
+from app.services.dataset_loader import DatasetRegistry, DatasetNotFoundError
+
+
+SOURCE_CSV = DATASETS_DIR / "online_shoppers_intention.csv"
+
+
+@pytest.fixture
+def datasets_dir(tmp_path):
+    """Three small, equally sized copies of the bundled dataset."""
+    lines = SOURCE_CSV.read_text().splitlines()[:201]
+    for dataset_id in ("a", "b", "c"):
+        (tmp_path / f"{dataset_id}.csv").write_text("\n".join(lines) + "\n")
+    return tmp_path
+
+
+def frame_bytes(datasets_dir):
+    registry = DatasetRegistry(datasets_dir, memory_budget_bytes=1 << 30)
+    registry.get_frame("a")
+    return registry.stats()["datasets"]["a"]["memory_bytes"]
+
+
+def test_discovers_csv_files(datasets_dir):
+    registry = DatasetRegistry(datasets_dir, memory_budget_bytes=1 << 30)
+
+    assert registry.dataset_ids() == ["a", "b", "c"]
+    with pytest.raises(DatasetNotFoundError):
+        registry.get_frame("missing")
+
+
+def test_evicts_least_recently_used_over_budget(datasets_dir):
+    budget = 2 * frame_bytes(datasets_dir) + 1024
+    registry = DatasetRegistry(datasets_dir, memory_budget_bytes=budget)
+
+    registry.get_frame("a")
+    registry.get_frame("b")
+    registry.get_frame("a")
+    registry.get_frame("c")
+
+    datasets = registry.stats()["datasets"]
+    assert [datasets[key]["loaded"] for key in ("a", "b", "c")] == [True, False, True]
+    assert datasets["b"]["evictions"] == 1
+    assert registry.stats()["memory_used_bytes"] <= budget
+
+
+def test_requested_dataset_is_never_evicted(datasets_dir):
+    registry = DatasetRegistry(datasets_dir, memory_budget_bytes=1)
+
+    frame = registry.get_frame("a")
+    metrics = registry.get_metrics("a")
+
+    stats = registry.stats()
+    assert len(frame) == 200
+    assert metrics["total_sessions"] == 200
+    assert stats["datasets"]["a"]["loaded"]
+    assert stats["memory_used_bytes"] > stats["memory_budget_bytes"]
+
+    registry.get_frame("b")
+
+    stats = registry.stats()
+    assert not stats["datasets"]["a"]["loaded"]
+    assert stats["datasets"]["b"]["loaded"]
+
+
+def test_counts_hits_loads_and_evictions(datasets_dir):
+    registry = DatasetRegistry(datasets_dir, memory_budget_bytes=1)
+
+    registry.get_frame("a")
+    registry.get_metrics("a")
+    registry.get_frame("b")
+    registry.get_frame("a")
+
+    stats = registry.stats()
+    assert stats["datasets"]["a"]["loaded"]
+    assert stats["datasets"]["a"]["hits"] == 1
+    assert stats["datasets"]["a"]["loads"] == 2
+    assert stats["datasets"]["a"]["evictions"] == 1
+    assert stats["datasets"]["b"]["loads"] == 1
+    assert stats["datasets"]["b"]["evictions"] == 1
+    assert stats["datasets"]["c"]["loads"] == 0
+    assert stats["evictions"] == 2
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from app.core.config import DATASETS_DIR
+from app.services.analysis_service import (
+    load_dataset,
+    compute_basic_metrics,
+    compute_extended_metrics,
+    SessionMetricsAccumulator,
+    QUANTILES
+)
+
+
+@pytest.fixture(scope="module")
+def df():
+    return load_dataset(str(DATASETS_DIR / "online_shoppers_intention.csv"))
+
+
+def assert_quantiles_close(result, df, tolerance=0.01):
+    """Each estimate lies within `tolerance` (as a fraction of n) of its rank."""
+    for col, estimates in result["distribution_quantiles"].items():
+        ordered = np.sort(df[col].to_numpy(dtype="float64"))
+        for label, q in QUANTILES.items():
+            estimate = np.float32(estimates[label])
+            low = np.searchsorted(ordered, estimate, side="left") / len(ordered)
+            high = np.searchsorted(ordered, estimate, side="right") / len(ordered)
+            assert low - tolerance <= q <= high + tolerance, (col, label)
+
+
+def test_chunked_matches_whole_frame(df):
+    whole = compute_extended_metrics(df, chunk_size=len(df))
+    chunked = compute_extended_metrics(df, chunk_size=1_000)
+
+    assert chunked["engagement_funnel"] == whole["engagement_funnel"]
+    assert chunked["page_type_engagement"] == whole["page_type_engagement"]
+    assert chunked["distribution_quantiles"].keys() == whole["distribution_quantiles"].keys()
+    assert_quantiles_close(chunked, df)
+    assert_quantiles_close(whole, df)
+
+
+def test_quantiles_are_reproducible(df):
+    first = compute_extended_metrics(df)
+    for _ in range(3):
+        assert compute_extended_metrics(df)["distribution_quantiles"] == first["distribution_quantiles"]
+
+
+def test_merged_shards_match_whole_frame(df):
+    whole = compute_extended_metrics(df)
+
+    merged = SessionMetricsAccumulator()
+    for start in range(0, len(df), 4_000):
+        shard = SessionMetricsAccumulator()
+        shard.update(df.iloc[start:start + 4_000])
+        merged.merge(shard)
+    result = merged.result()
+
+    assert merged.sessions == len(df)
+    for col, sketch in merged.sketches.items():
+        assert sketch.n == df[col].notna().sum()
+    assert result["engagement_funnel"] == whole["engagement_funnel"]
+    assert result["page_type_engagement"] == whole["page_type_engagement"]
+    assert_quantiles_close(result, df)
+
+
+def test_funnel_stages_are_independent(df):
+    metrics = compute_extended_metrics(df)
+    funnel = {stage["stage"]: stage for stage in metrics["engagement_funnel"]}
+    basic = compute_basic_metrics(df)
+
+    assert funnel["All sessions"]["sessions"] == len(df)
+    assert funnel["All sessions"]["conversion_rate"] == basic["conversion_rate"]
+    assert funnel["Purchased"]["sessions"] == basic["total_conversions"]
+    assert funnel["Purchased"]["conversion_rate"] == 100.0
+
+    account = metrics["page_type_engagement"]["Administrative"]
+    assert funnel["Viewed account pages"]["sessions"] == account["sessions_reached"]
+    assert funnel["Viewed account pages"]["conversion_rate"] == account["conversion_rate"]
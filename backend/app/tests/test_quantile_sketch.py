@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from app.services.quantile_sketch import KLLSketch
+
+
+RANKS = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def total_weight(sketch: KLLSketch) -> int:
+    return sum(len(level) * 2 ** h for h, level in enumerate(sketch._levels))
+
+
+def max_rank_error(sketch: KLLSketch, values: np.ndarray) -> float:
+    """Largest distance between requested and actual rank, as a fraction of n."""
+    ordered = np.sort(values)
+    errors = []
+    for q, estimate in zip(RANKS, sketch.quantiles(RANKS)):
+        low = np.searchsorted(ordered, estimate, side="left") / len(ordered)
+        high = np.searchsorted(ordered, estimate, side="right") / len(ordered)
+        errors.append(max(0.0, low - q, q - high))
+    return max(errors)
+
+
+def test_exact_while_first_compactor_fits():
+    values = np.random.default_rng(1).normal(size=500)
+    sketch = KLLSketch(seed=1)
+    sketch.update(values)
+
+    expected = np.quantile(values, RANKS, method="inverted_cdf")
+    assert sketch.quantiles(RANKS) == pytest.approx(expected)
+
+
+def test_empty_sketch_and_nans():
+    sketch = KLLSketch(seed=1)
+    assert sketch.quantiles([0.5]) == [None]
+
+    sketch.update([1.0, np.nan, 3.0])
+    assert sketch.n == 2
+    assert sketch.quantiles([0.0, 1.0]) == [1.0, 3.0]
+
+
+def test_compaction_preserves_weight():
+    sketch = KLLSketch(k=64, seed=1)
+    for chunk in np.array_split(np.random.default_rng(2).random(100_000), 37):
+        sketch.update(chunk)
+        assert total_weight(sketch) == sketch.n
+
+    assert sketch.n == 100_000
+    assert sum(len(level) for level in sketch._levels) < 1_000
+
+
+def test_rank_error_is_bounded():
+    values = np.random.default_rng(3).lognormal(size=200_000)
+    sketch = KLLSketch(seed=3)
+    sketch.update(values)
+
+    assert max_rank_error(sketch, values) < 0.01
+
+
+def test_merge_matches_single_stream():
+    values = np.random.default_rng(4).exponential(size=200_000)
+    shards = np.array_split(values, 4)
+
+    merged = KLLSketch(seed=10)
+    merged.update(shards[0])
+    for seed, shard in enumerate(shards[1:], start=11):
+        sketch = KLLSketch(seed=seed)
+        sketch.update(shard)
+        merged.merge(sketch)
+
+    assert merged.n == len(values)
+    assert total_weight(merged) == len(values)
+    assert max_rank_error(merged, values) < 0.01
+
+
+def test_merge_rejects_different_k():
+    with pytest.raises(ValueError):
+        KLLSketch(k=64).merge(KLLSketch(k=128))
+
+
+def test_default_seeds_are_independent():
+    values = np.random.default_rng(5).random(50_000)
+    first, second = KLLSketch(), KLLSketch()
+    first.update(values)
+    second.update(values)
+
+    assert any(
+        not np.array_equal(a, b) for a, b in zip(first._levels, second._levels)
+    )
@@ -0,0 +1,74 @@
+import mmap
+import os
+
+import pandas as pd
+import pytest
+
+from app.core.config import DATASETS_DIR
+from app.services.analysis_service import load_dataset
+from app.services.dataset_loader import DatasetRegistry
+from app.services.shared_dataset import SharedDatasetStore
+
+
+SOURCE_CSV = DATASETS_DIR / "online_shoppers_intention.csv"
+
+pytest.importorskip("fcntl")
+
+
+@pytest.fixture
+def source(tmp_path):
+    datasets_dir = tmp_path / "datasets"
+    datasets_dir.mkdir()
+    lines = SOURCE_CSV.read_text().splitlines()[:501]
+    path = datasets_dir / "sessions.csv"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def is_mapped(array) -> bool:
+    """True if `array` is a view of an mmap rather than private memory."""
+    while array is not None:
+        if isinstance(array, mmap.mmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+def test_attached_columns_are_views_of_the_snapshot(source, tmp_path):
+    store = SharedDatasetStore(tmp_path / "shm")
+    version = store.ensure_published("sessions", source)
+
+    frame = store.attach("sessions", version)
+
+    assert frame.equals(load_dataset(str(source)))
+    for name in frame.columns:
+        column = frame[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            values = column.array.codes
+        else:
+            values = column.to_numpy()
+        assert is_mapped(values), name
+
+
+def test_frame_and_metrics_come_from_one_snapshot(source, tmp_path):
+    registry = DatasetRegistry(
+        source.parent,
+        memory_budget_bytes=1 << 30,
+        shared_store=SharedDatasetStore(tmp_path / "shm")
+    )
+
+    frame, metrics = registry.get_frame_and_metrics("sessions")
+    assert metrics["total_sessions"] == len(frame) == 500
+
+    lines = source.read_text().splitlines()[:301]
+    source.write_text("\n".join(lines) + "\n")
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    frame, metrics = registry.get_frame_and_metrics("sessions")
+    assert metrics["total_sessions"] == len(frame) == 300
+
+    stats = registry.stats()["datasets"]["sessions"]
+    assert stats["version"] == 2
+    assert stats["loads"] == 2
+    assert stats["hits"] == 0
@@ -0,0 +1,56 @@
+"""
+Dataset memory benchmark: pandas default inference vs the compact schema.
+
+Reports total in-memory bytes for both representations and the time taken
+by `compute_basic_metrics` on each.
+
+Run from the `backend/` directory:
+
+    python benchmarks/bench_dataset_memory.py
+"""
+import sys
+import time
+from pathlib import Path
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import pandas as pd  # noqa: E402
+
+from app.core.config import DATASETS_DIR  # noqa: E402
+from app.services.analysis_service import (  # noqa: E402
+    apply_session_schema,
+    compute_basic_metrics,
+    memory_footprint
+)
+
+
+DATASET_PATH = DATASETS_DIR / "online_shoppers_intention.csv"
+REPEATS = 50
+
+
+def _time_metrics(df: pd.DataFrame) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        compute_basic_metrics(df)
+    return (time.perf_counter() - started) / REPEATS * 1000
+
+
+def main() -> None:
+    inferred = pd.read_csv(DATASET_PATH)
+    compact = apply_session_schema(inferred)
+
+    inferred_bytes = memory_footprint(inferred)["total_bytes"]
+    compact_bytes = memory_footprint(compact)["total_bytes"]
+
+    print(f"inferred: {inferred_bytes:,} bytes, metrics {_time_metrics(inferred):.2f} ms")
+    print(f"compact:  {compact_bytes:,} bytes, metrics {_time_metrics(compact):.2f} ms")
+    print(f"memory reduction: {inferred_bytes / compact_bytes:.1f}x")
+
+    if compute_basic_metrics(inferred) != compute_basic_metrics(compact):
+        print("warning: metrics differ between representations")
+
+
+if __name__ == "__main__":
+    main()
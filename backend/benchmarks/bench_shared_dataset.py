@@ -0,0 +1,83 @@
+"""
+Per-worker memory benchmark: process-local vs shared dataset storage.
+
+Starts several worker-like processes for each DATASET_STORAGE mode. Each one
+loads the default dataset through the registry and computes metrics, then
+reports its private (RssAnon) and file/shared-mapped (RssFile + RssShmem)
+resident memory from /proc. Shared mode should keep private memory flat.
+Linux only.
+
+Run from the `backend/` directory:
+
+    python benchmarks/bench_shared_dataset.py [workers]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _rss_kb() -> dict:
+    fields = {}
+    with open("/proc/self/status") as status:
+        for line in status:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile", "RssShmem"):
+                fields[key] = int(value.split()[0])
+    return fields
+
+
+def _child() -> None:
+    sys.path.insert(0, str(BACKEND_DIR))
+    import pandas  # noqa: F401  (import cost is excluded from the baseline)
+
+    from app.core.config import get_settings
+    from app.services.dataset_loader import get_dataset_registry
+
+    before = _rss_kb()
+    registry = get_dataset_registry()
+    registry.get_metrics(get_settings().default_dataset_id)
+    after = _rss_kb()
+
+    print(json.dumps({key: after[key] - before.get(key, 0) for key in after}))
+
+
+def _run(mode: str, workers: int, shared_dir: str) -> list:
+    env = dict(os.environ, DATASET_STORAGE=mode, SHARED_DATASET_DIR=shared_dir)
+    env.setdefault("MISTRAL_API_KEY", "benchmark")
+    processes = [
+        subprocess.Popen(
+            [sys.executable, __file__, "--child"],
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True
+        )
+        for _ in range(workers)
+    ]
+    return [json.loads(process.communicate()[0].strip().splitlines()[-1]) for process in processes]
+
+
+def main() -> None:
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    with tempfile.TemporaryDirectory() as shared_dir:
+        for mode in ("process", "shared"):
+            results = _run(mode, workers, shared_dir)
+            private = [result["RssAnon"] for result in results]
+            mapped = [result["RssFile"] + result.get("RssShmem", 0) for result in results]
+            print(
+                f"{mode:>7}: private delta per worker (KiB) {private}, "
+                f"mapped delta per worker (KiB) {mapped}"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 2 and sys.argv[1] == "--child":
+        _child()
+    else:
+        main()
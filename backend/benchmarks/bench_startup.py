@@ -0,0 +1,105 @@
+"""
+Startup benchmark: import time and time-to-first-response.
+
+Each scenario runs in a fresh interpreter so module caches start cold.
+The Mistral API is replaced by an in-process httpx MockTransport returning a
+canned insights payload, so timings reflect only this service.
+
+Run from the `backend/` directory:
+
+    python benchmarks/bench_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+CANNED_INSIGHTS = {
+    "summary": "Benchmark summary.",
+    "insights": [
+        {
+            "id": "insight_1",
+            "title": "Benchmark insight",
+            "severity": "low",
+            "metric_evidence": "n/a",
+            "hypothesized_cause": "n/a",
+            "recommendation": "n/a",
+            "target_segment": "n/a"
+        }
+    ]
+}
+
+
+def _bench_import() -> dict:
+    started = time.perf_counter()
+    import app.main  # noqa: F401
+    elapsed = time.perf_counter() - started
+    return {
+        "import_ms": round(elapsed * 1000, 2),
+        "pandas_imported": "pandas" in sys.modules
+    }
+
+
+def _bench_first_response() -> dict:
+    import httpx
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.services.mistral_client import get_mistral_client
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        content = json.dumps(CANNED_INSIGHTS)
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+    get_mistral_client()._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    started = time.perf_counter()
+    with TestClient(app) as client:
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.005)
+        ready_at = time.perf_counter()
+        response = client.get("/api/v1/analyze")
+        first_at = time.perf_counter()
+        response.raise_for_status()
+        client.get("/api/v1/analyze")
+        second_at = time.perf_counter()
+
+    return {
+        "ready_ms": round((ready_at - started) * 1000, 2),
+        "first_analyze_ms": round((first_at - ready_at) * 1000, 2),
+        "second_analyze_ms": round((second_at - first_at) * 1000, 2)
+    }
+
+
+def _run_child(scenario: str, startup_mode: str) -> dict:
+    env = dict(os.environ, STARTUP_MODE=startup_mode)
+    env.setdefault("MISTRAL_API_KEY", "benchmark")
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", scenario],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    print("import app.main:", _run_child("import", "warm"))
+    for mode in ("lazy", "warm"):
+        print(f"first response ({mode}):", _run_child("first_response", mode))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        sys.path.insert(0, str(BACKEND_DIR))
+        scenario = {"import": _bench_import, "first_response": _bench_first_response}
+        print(json.dumps(scenario[sys.argv[2]]()))
+    else:
+        main()
@@ -9,7 +9,8 @@ import {
   type FormEvent,
 } from "react";
 
-import { askQuestion } from "@/lib/api-client";
+import { ApiError, askQuestion } from "@/lib/api-client";
+import type { UXChatResponse } from "@/lib/types";
 
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
@@ -39,6 +40,7 @@ export function ChatPanel({
   const [question, setQuestion] = useState("");
   const [isSending, setIsSending] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [sessionId, setSessionId] = useState<string | null>(null);
   const bottomRef = useRef<HTMLDivElement | null>(null);
 
   useEffect(() => {
@@ -46,6 +48,7 @@ export function ChatPanel({
   }, [messages]);
 
   useEffect(() => {
+    setSessionId(null);
     if (enabled) {
       setMessages([{ role: "assistant", content: welcomeMessage }]);
     } else {
@@ -72,7 +75,19 @@ export function ChatPanel({
       setIsSending(true);
 
       try {
-        const response = await askQuestion(trimmed);
+        let response: UXChatResponse;
+        try {
+          response = await askQuestion(trimmed, sessionId);
+        } catch (err) {
+          // Sessions live in one backend process and expire when idle;
+          // drop a session the server no longer knows and start a new one.
+          if (!sessionId || !(err instanceof ApiError) || err.status !== 404) {
+            throw err;
+          }
+          setSessionId(null);
+          response = await askQuestion(trimmed, null);
+        }
+        setSessionId(response.session_id);
         setMessages((prev) => [
           ...prev,
           {
@@ -88,7 +103,7 @@ export function ChatPanel({
         setIsSending(false);
       }
     },
-    [canSend, question]
+    [canSend, question, sessionId]
   );
 
   return (
@@ -3,6 +3,13 @@ import type { UXChatResponse, UXInsightsResponse } from "./types";
 const API_BASE =
   process.env.NEXT_PUBLIC_API_BASE_URL ?? "http://localhost:8000";
 
+export class ApiError extends Error {
+  constructor(message: string, readonly status: number) {
+    super(message);
+    this.name = "ApiError";
+  }
+}
+
 async function handleResponse<T>(res: Response, defaultMessage: string) {
   if (!res.ok) {
     let errorMessage = defaultMessage;
@@ -19,7 +26,7 @@ async function handleResponse<T>(res: Response, defaultMessage: string) {
       const text = await res.text().catch(() => "");
       if (text) errorMessage = text;
     }
-    throw new Error(errorMessage);
+    throw new ApiError(errorMessage, res.status);
   }
   return (await res.json()) as T;
 }
@@ -29,11 +36,14 @@ export async function fetchInsights(): Promise<UXInsightsResponse> {
   return handleResponse(res, "Failed to fetch insights");
 }
 
-export async function askQuestion(question: string): Promise<UXChatResponse> {
+export async function askQuestion(
+  question: string,
+  sessionId?: string | null
+): Promise<UXChatResponse> {
   const res = await fetch(`${API_BASE}/api/v1/chat`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ question }),
+    body: JSON.stringify({ question, session_id: sessionId ?? undefined }),
   });
   return handleResponse(res, "Failed to send question");
 }
@@ -18,5 +18,6 @@ export interface UXInsightsResponse {
 export interface UXChatResponse {
   answer: string;
   used_insights?: string[] | null;
+  session_id: string;
 }
 